@@ -0,0 +1,59 @@
+"""
+In-process cache of static borough metadata.
+
+Borough names and total areas are written once by `scripts/load_boroughs.py`
+and never change while the server runs, so they are loaded at startup and
+served from memory instead of being re-queried on every request.
+"""
+
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Borough
+
+logger = logging.getLogger(__name__)
+
+# borough_id -> (name, total_area)
+_boroughs: dict[int, tuple[str, float]] = {}
+
+
+async def load_borough_cache(session: AsyncSession) -> None:
+    """(Re)populate the cache with one query over the boroughs table."""
+    result = await session.execute(select(Borough.id, Borough.name, Borough.total_area))
+    rows = result.all()
+    _boroughs.clear()
+    _boroughs.update({row.id: (row.name, row.total_area) for row in rows})
+
+
+async def warm_borough_cache(session: AsyncSession) -> None:
+    """Best-effort startup load; a miss later will retry via `get_borough_meta`."""
+    try:
+        await load_borough_cache(session)
+    except (OSError, SQLAlchemyError):
+        logger.warning("Could not preload borough cache; will load on first use", exc_info=True)
+
+
+async def get_borough_meta(
+    session: AsyncSession, borough_id: int
+) -> tuple[str, float] | None:
+    """
+    Return `(name, total_area)` for a borough, or None if it does not exist.
+
+    Reloads the cache once on a miss so boroughs loaded after startup are
+    picked up.
+    """
+    meta = _boroughs.get(borough_id)
+    if meta is None:
+        await load_borough_cache(session)
+        meta = _boroughs.get(borough_id)
+    return meta
+
+
+async def list_borough_meta(session: AsyncSession) -> dict[int, tuple[str, float]]:
+    """Return the cached `{borough_id: (name, total_area)}` mapping."""
+    if not _boroughs:
+        await load_borough_cache(session)
+    return _boroughs
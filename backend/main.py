@@ -1,14 +1,41 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .config import get_settings
+from .borough_cache import warm_borough_cache
+from .config import Settings
+from .database import get_engine, get_sessionmaker
+from .responses import ORJSONResponse
 from .routes import activities, boroughs, health, stats, users
 
 
-def create_app() -> FastAPI:
-    settings = get_settings()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # One engine (and connection pool) per process, disposed on shutdown.
+    app.state.engine = get_engine(app.state.settings)
+    app.state.sessionmaker = get_sessionmaker(app.state.engine)
+
+    # Static borough metadata is served from memory; load it once up front.
+    async with app.state.sessionmaker() as session:
+        await warm_borough_cache(session)
+
+    yield
+
+    await app.state.engine.dispose()
 
-    app = FastAPI(title=settings.app_name)
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    settings = settings or Settings()
+
+    app = FastAPI(
+        title=settings.app_name,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+    # Loaded once per app and injected into handlers via `config.get_settings`.
+    app.state.settings = settings
 
     # Basic CORS setup for local/mobile dev; tighten later as needed.
     app.add_middleware(
@@ -9,16 +9,24 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     String,
     Text,
+    UniqueConstraint,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship
 
 from .database import Base
 
 UUIDStr = Annotated[str, mapped_column(UUID(as_uuid=False), primary_key=True)]
 
+# Stored geometries keep 7 decimal digits of a degree (~1 cm); the remaining
+# mantissa bits are zeroed with ST_QuantizeCoordinates so WKB compresses well.
+COORDINATE_DECIMALS = 7
+
 
 class ActivityType(str, enum.Enum):
     GPX = "gpx"
@@ -30,11 +38,17 @@ class Borough(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
-    geometry = Column(Geometry(geometry_type="MULTIPOLYGON", srid=4326), nullable=False)
+    geometry = deferred(
+        Column(
+            Geometry(geometry_type="MULTIPOLYGON", srid=4326, spatial_index=True),
+            nullable=False,
+        ),
+        raiseload=True,
+    )
     total_area: Mapped[float] = mapped_column(Float, nullable=False)
 
     unveiled_areas: Mapped[list["UnveiledArea"]] = relationship(
-        "UnveiledArea", back_populates="borough"
+        "UnveiledArea", back_populates="borough", lazy="raise"
     )
 
 
@@ -45,55 +59,133 @@ class User(Base):
         UUID(as_uuid=False), primary_key=True, nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     chosen_borough_id: Mapped[int | None] = mapped_column(
         ForeignKey("boroughs.id"), nullable=True
     )
 
-    chosen_borough: Mapped[Borough | None] = relationship("Borough")
+    chosen_borough: Mapped[Borough | None] = relationship("Borough", lazy="raise")
     unveiled_areas: Mapped[list["UnveiledArea"]] = relationship(
-        "UnveiledArea", back_populates="user"
+        "UnveiledArea", back_populates="user", lazy="raise"
     )
     activities: Mapped[list["Activity"]] = relationship(
-        "Activity", back_populates="user"
+        "Activity", back_populates="user", lazy="raise"
     )
 
 
 class UnveiledArea(Base):
     __tablename__ = "unveiled_areas"
+    # One merged area per user and borough; compaction upserts against this.
+    __table_args__ = (
+        UniqueConstraint("user_id", "borough_id", name="uq_unveiled_user_borough"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
     borough_id: Mapped[int] = mapped_column(ForeignKey("boroughs.id"), nullable=False)
-    geometry = Column(Geometry(geometry_type="MULTIPOLYGON", srid=4326), nullable=False)
+    geometry = deferred(
+        Column(
+            Geometry(geometry_type="MULTIPOLYGON", srid=4326, spatial_index=True),
+            nullable=False,
+        ),
+        raiseload=True,
+    )
+    # ST_Area of `geometry` in square meters, maintained whenever it changes.
+    cached_area_m2: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default=text("0")
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    user: Mapped[User] = relationship(
+        "User", back_populates="unveiled_areas", lazy="raise"
+    )
+    borough: Mapped[Borough] = relationship(
+        "Borough", back_populates="unveiled_areas", lazy="raise"
+    )
+
+
+class UnveiledFragment(Base):
+    """
+    A single not-yet-merged piece of unveiled area (e.g. one check-in buffer).
+
+    Fragments are appended on write and folded into `UnveiledArea` in one
+    cascaded union on read, instead of unioning on every check-in.
+    """
+
+    __tablename__ = "unveiled_fragments"
+    __table_args__ = (Index("ix_fragment_user_borough", "user_id", "borough_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
+    borough_id: Mapped[int] = mapped_column(ForeignKey("boroughs.id"), nullable=False)
+    geometry = deferred(
+        Column(
+            Geometry(geometry_type="MULTIPOLYGON", srid=4326, spatial_index=True),
+            nullable=False,
+        ),
+        raiseload=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    user: Mapped[User] = relationship("User", back_populates="unveiled_areas")
-    borough: Mapped[Borough] = relationship("Borough", back_populates="unveiled_areas")
+
+# Maximum vertices per ST_Subdivide tile of a merged unveiled area.
+TILE_MAX_VERTICES = 256
+
+
+class UnveiledAreaTile(Base):
+    """
+    One `ST_Subdivide` piece of a user's merged UnveiledArea.
+
+    Tiles are small and disjoint, so areas can be summed without a union and
+    spatial predicates only touch the tiles whose bounding boxes match.
+    Rebuilt from `UnveiledArea.geometry` whenever fragments are compacted.
+    """
+
+    __tablename__ = "unveiled_area_tiles"
+    __table_args__ = (Index("ix_tile_user_borough", "user_id", "borough_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
+    borough_id: Mapped[int] = mapped_column(ForeignKey("boroughs.id"), nullable=False)
+    geometry = deferred(
+        Column(
+            Geometry(geometry_type="POLYGON", srid=4326, spatial_index=True),
+            nullable=False,
+        ),
+        raiseload=True,
+    )
 
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (Index("ix_activity_user_type", "user_id", "type"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
     borough_id: Mapped[int] = mapped_column(ForeignKey("boroughs.id"), nullable=False)
     type: Mapped[ActivityType] = mapped_column(Enum(ActivityType), nullable=False)
     raw_gpx_path: Mapped[str | None] = mapped_column(Text, nullable=True)
-    raw_location = Column(
-        Geometry(geometry_type="POINT", srid=4326), nullable=True
-    )  # for check-ins
-    processed_geometry = Column(
-        Geometry(geometry_type="MULTILINESTRING", srid=4326), nullable=True
+    raw_location = deferred(  # for check-ins
+        Column(Geometry(geometry_type="POINT", srid=4326, spatial_index=True), nullable=True),
+        raiseload=True,
+    )
+    processed_geometry = deferred(
+        Column(
+            Geometry(geometry_type="MULTILINESTRING", srid=4326, spatial_index=True),
+            nullable=True,
+        ),
+        raiseload=True,
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    user: Mapped[User] = relationship("User", back_populates="activities")
-    borough: Mapped[Borough] = relationship("Borough")
+    user: Mapped[User] = relationship("User", back_populates="activities", lazy="raise")
+    borough: Mapped[Borough] = relationship("Borough", lazy="raise")
 
 
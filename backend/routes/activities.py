@@ -1,24 +1,47 @@
-from fastapi import APIRouter, Depends, File, Header, UploadFile
-from sqlalchemy import func, select, update
+import os
+import shutil
+from typing import BinaryIO
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from geoalchemy2 import Geography, Geometry
+from sqlalchemy import Float, bindparam, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config import get_settings
+from ..borough_cache import get_borough_meta
+from ..config import Settings, get_settings
 from ..database import get_session
-from ..models import Activity, ActivityType, Borough, UnveiledArea, User
+from ..models import (
+    COORDINATE_DECIMALS,
+    Activity,
+    ActivityType,
+    Borough,
+    UnveiledFragment,
+    User,
+)
 from ..schemas import CheckinRequest, GPXUploadResponse
 
 router = APIRouter(prefix="/activities", tags=["activities"])
 
+GPX_CHUNK_SIZE = 1 << 16  # 64 KiB
 
-async def _get_or_create_user(session: AsyncSession, user_id: str) -> User:
-    result = await session.execute(select(User).where(User.id == user_id))
-    user: User | None = result.scalar_one_or_none()
-    if user is None:
-        user = User(id=user_id)
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
-    return user
+
+def _store_gpx(src: BinaryIO, directory: str) -> str:
+    """Stream an uploaded GPX file to `directory` in fixed-size chunks."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid4()}.gpx")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(src, out, GPX_CHUNK_SIZE)
+    return path
+
+
+async def _ensure_user(session: AsyncSession, user_id: str) -> None:
+    """Create the anonymous user row if it does not exist yet, in one statement."""
+    await session.execute(
+        insert(User).values(id=user_id).on_conflict_do_nothing(index_elements=["id"])
+    )
 
 
 @router.post("/gpx", response_model=GPXUploadResponse)
@@ -27,6 +50,7 @@ async def upload_gpx(
     file: UploadFile = File(...),
     x_user_id: str = Header(..., alias="X-User-Id"),
     session: AsyncSession = Depends(get_session),
+    settings: Settings = Depends(get_settings),
 ) -> GPXUploadResponse:
     """
     Accept a GPX file upload, associate it with a user, and trigger processing.
@@ -35,21 +59,17 @@ async def upload_gpx(
     as a follow-up implementation detail; this endpoint persists a minimal
     activity record that can be extended.
     """
-    settings = get_settings()
-    _ = settings  # referenced to avoid 'unused' warnings for now
-
-    user = await _get_or_create_user(session, x_user_id)
+    await _ensure_user(session, x_user_id)
 
-    # For now we do not parse the GPX contents here; they can be stored or
-    # handed to a background worker in a more advanced setup.
-    contents = await file.read()
-    raw_ref = f"gpx:{len(contents)}bytes"
+    # Copy the whole upload to disk in one worker-thread hop rather than
+    # awaiting a thread round-trip per chunk on the event loop.
+    gpx_path = await run_in_threadpool(_store_gpx, file.file, settings.gpx_storage_dir)
 
     activity = Activity(
-        user_id=user.id,
+        user_id=x_user_id,
         borough_id=borough_id,
         type=ActivityType.GPX,
-        raw_gpx_path=raw_ref,
+        raw_gpx_path=gpx_path,
     )
     session.add(activity)
     await session.commit()
@@ -60,6 +80,29 @@ async def upload_gpx(
     return GPXUploadResponse(activity_id=activity.id)
 
 
+def _checkin_fragment_geometry(longitude, latitude, borough_geometry):
+    """
+    Build the unveiled fragment for a check-in: a 100m buffer around the
+    point, clipped to the borough. Arguments may be values or SQL expressions.
+    """
+    # Create a POINT from lat/lon (SRID 4326) as geography so it can be
+    # buffered in meters directly, without reprojecting to 3857 and back.
+    point_geog = cast(
+        func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326),
+        Geography(srid=4326),
+    )
+
+    # 100m buffer around check-in location
+    buffer_geom = cast(func.ST_Buffer(point_geog, 100), Geometry(srid=4326))
+
+    return func.ST_QuantizeCoordinates(
+        func.ST_Multi(
+            func.ST_CollectionExtract(func.ST_Intersection(buffer_geom, borough_geometry), 3)
+        ),
+        COORDINATE_DECIMALS,
+    )
+
+
 @router.post("/checkin")
 async def checkin(
     borough_id: int,
@@ -70,58 +113,36 @@ async def checkin(
     """
     Manual check-in endpoint.
 
-    For now, it records an activity and updates the unveiled area using
-    a simple PostGIS buffer/union expression if geometry is configured.
+    Records an activity and appends the buffered check-in location as an
+    unveiled fragment; no union is performed on the write path.
     """
-    user = await _get_or_create_user(session, x_user_id)
+    # Ensure borough exists (from the in-process cache); its geometry stays
+    # in Postgres and is referenced by subquery below.
+    if await get_borough_meta(session, borough_id) is None:
+        raise HTTPException(status_code=404, detail="Borough not found")
 
-    # Ensure borough exists
-    result = await session.execute(select(Borough).where(Borough.id == borough_id))
-    borough: Borough | None = result.scalar_one_or_none()
-    if borough is None:
-        raise RuntimeError("Borough not found")
+    await _ensure_user(session, x_user_id)
 
-    # Create a POINT geometry from lat/lon (SRID 4326)
-    point_geom = func.ST_SetSRID(
-        func.ST_MakePoint(payload.longitude, payload.latitude), 4326
+    # Intersect with borough geometry and append as a fragment; fragments are
+    # merged into the unveiled area lazily (see routes/stats.py).
+    borough_geometry = (
+        select(Borough.geometry).where(Borough.id == borough_id).scalar_subquery()
     )
-
-    # 100m buffer around check-in location
-    buffer_geom = func.ST_Buffer(
-        func.ST_Transform(point_geom, 3857), 100  # approximate in meters
+    intersected = _checkin_fragment_geometry(
+        payload.longitude, payload.latitude, borough_geometry
     )
-    buffer_geom = func.ST_Transform(buffer_geom, 4326)
-
-    # Intersect with borough geometry and merge into unveiled area
-    intersected = func.ST_Intersection(buffer_geom, borough.geometry)
-
-    result = await session.execute(
-        select(UnveiledArea).where(
-            UnveiledArea.user_id == user.id,
-            UnveiledArea.borough_id == borough.id,
-        )
-    )
-    unveiled: UnveiledArea | None = result.scalar_one_or_none()
-
-    if unveiled is None:
-        unveiled = UnveiledArea(
-            user_id=user.id,
-            borough_id=borough.id,
+    session.add(
+        UnveiledFragment(
+            user_id=x_user_id,
+            borough_id=borough_id,
             geometry=intersected,
         )
-        session.add(unveiled)
-    else:
-        merged_geom = func.ST_Union(unveiled.geometry, intersected)
-        await session.execute(
-            update(UnveiledArea)
-                .where(UnveiledArea.id == unveiled.id)
-                .values(geometry=merged_geom)
-        )
+    )
 
     # Record the check-in activity
     activity = Activity(
-        user_id=user.id,
-        borough_id=borough.id,
+        user_id=x_user_id,
+        borough_id=borough_id,
         type=ActivityType.CHECKIN,
     )
     session.add(activity)
@@ -131,3 +152,68 @@ async def checkin(
     return {"status": "ok"}
 
 
+def _batch_fragments_insert(user_id: str, borough_id: int, payload: list[CheckinRequest]):
+    """
+    INSERT ... SELECT of one fragment per check-in, over the unnested
+    coordinate arrays.
+    """
+    # render_derived() names the columns in the alias, AS anon(longitude,
+    # latitude); a multi-argument unnest otherwise calls both "unnest".
+    points = (
+        func.unnest(
+            bindparam("longitudes", [c.longitude for c in payload], type_=ARRAY(Float)),
+            bindparam("latitudes", [c.latitude for c in payload], type_=ARRAY(Float)),
+        )
+        .table_valued("longitude", "latitude")
+        .render_derived()
+    )
+    borough_geometry = (
+        select(Borough.geometry).where(Borough.id == borough_id).scalar_subquery()
+    )
+    return insert(UnveiledFragment).from_select(
+        ["user_id", "borough_id", "geometry"],
+        select(
+            literal(user_id, UnveiledFragment.user_id.type),
+            literal(borough_id, UnveiledFragment.borough_id.type),
+            _checkin_fragment_geometry(
+                points.c.longitude, points.c.latitude, borough_geometry
+            ),
+        ).select_from(points),
+    )
+
+
+@router.post("/checkin/batch")
+async def checkin_batch(
+    borough_id: int,
+    payload: list[CheckinRequest],
+    x_user_id: str = Header(..., alias="X-User-Id"),
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """
+    Record many check-ins in one request.
+
+    All fragments are written by a single INSERT ... SELECT over the
+    unnested coordinates, and the activity rows are bulk-loaded with COPY.
+    """
+    if not payload:
+        return {"status": "ok", "count": 0}
+
+    if await get_borough_meta(session, borough_id) is None:
+        raise HTTPException(status_code=404, detail="Borough not found")
+
+    await _ensure_user(session, x_user_id)
+    await session.execute(_batch_fragments_insert(x_user_id, borough_id, payload))
+
+    # COPY the activity rows over the session's own asyncpg connection so
+    # they commit in the same transaction as the fragments.
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        Activity.__tablename__,
+        columns=["user_id", "borough_id", "type"],
+        records=[(x_user_id, borough_id, ActivityType.CHECKIN.name) for _ in payload],
+    )
+
+    await session.commit()
+
+    return {"status": "ok", "count": len(payload)}
@@ -1,49 +1,70 @@
-import json
-
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..borough_cache import list_borough_meta
 from ..database import get_session
 from ..models import Borough
 from ..schemas import BoroughBase, BoroughDetail
 
 router = APIRouter(prefix="/boroughs", tags=["boroughs"])
 
+# ~10 m in degrees at NYC's latitude; plenty for drawing borough outlines.
+GEOMETRY_SIMPLIFY_TOLERANCE = 0.0001
+# 5 decimal places of a degree is ~1 m.
+GEOJSON_MAX_DECIMALS = 5
+
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": list[BoroughBase]}},
+)
+async def list_boroughs(session: AsyncSession = Depends(get_session)) -> list[dict]:
+    """
+    Return all configured boroughs without heavy geometry payloads.
 
-@router.get("/", response_model=list[BoroughBase])
-async def list_boroughs(session: AsyncSession = Depends(get_session)) -> list[BoroughBase]:
-    """Return all configured boroughs without heavy geometry payloads."""
-    result = await session.execute(select(Borough.id, Borough.name))
-    rows = result.all()
-    return [BoroughBase(id=row.id, name=row.name) for row in rows]
+    The shape is trivial and built from the borough cache, so plain dicts are
+    returned without a Pydantic validation pass.
+    """
+    boroughs = await list_borough_meta(session)
+    return [
+        {"id": borough_id, "name": name}
+        for borough_id, (name, _total_area) in sorted(boroughs.items())
+    ]
 
 
 @router.get("/{borough_id}", response_model=BoroughDetail)
 async def get_borough(
     borough_id: int, session: AsyncSession = Depends(get_session)
-) -> BoroughDetail:
-    """Return a single borough including geometry and total area."""
+) -> Response:
+    """
+    Return a single borough including geometry and total area.
+
+    The geometry is simplified for map rendering and the whole JSON body is
+    built by PostGIS, so it is passed through without a parse/re-serialize
+    round-trip in Python.
+    """
+    geometry = func.ST_AsGeoJSON(
+        func.ST_SimplifyPreserveTopology(Borough.geometry, GEOMETRY_SIMPLIFY_TOLERANCE),
+        GEOJSON_MAX_DECIMALS,
+    )
     result = await session.execute(
         select(
-            Borough.id,
-            Borough.name,
-            Borough.total_area,
-            func.ST_AsGeoJSON(Borough.geometry),
+            cast(
+                func.json_build_object(
+                    "id", Borough.id,
+                    "name", Borough.name,
+                    "total_area", Borough.total_area,
+                    "geometry", cast(geometry, JSON),
+                ),
+                Text,
+            )
         ).where(Borough.id == borough_id)
     )
-    row = result.one_or_none()
-    if row is None:
+    body: str | None = result.scalar_one_or_none()
+    if body is None:
         raise RuntimeError("Borough not found")
 
-    geojson_raw: str | None = row[3]
-    geometry = json.loads(geojson_raw) if geojson_raw else None
-
-    return BoroughDetail(
-        id=row.id,
-        name=row.name,
-        total_area=row.total_area,
-        geometry=geometry,
-    )
-
-
+    return Response(content=body, media_type="application/json")
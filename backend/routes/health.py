@@ -1,14 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from ..config import get_settings
+from ..config import Settings, get_settings
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health", summary="Health check")
-async def health_check() -> dict:
+async def health_check(settings: Settings = Depends(get_settings)) -> dict:
     """Simple health-check endpoint for uptime and environment verification."""
-    settings = get_settings()
     return {
         "status": "ok",
         "app": settings.app_name,
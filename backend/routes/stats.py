@@ -1,13 +1,222 @@
 from fastapi import APIRouter, Depends, Header
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..borough_cache import get_borough_meta
 from ..database import get_session
-from ..models import Borough, UnveiledArea, User
+from ..models import (
+    COORDINATE_DECIMALS,
+    TILE_MAX_VERTICES,
+    UnveiledArea,
+    UnveiledAreaTile,
+    UnveiledFragment,
+    User,
+)
 from ..schemas import CoreScore
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+# Once a user has this many pending fragments, fold them into UnveiledArea so
+# the on-read union stays small.
+FRAGMENT_COMPACTION_THRESHOLD = 50
+
+
+def _unveiled_pieces(user_id, borough_id, max_fragment_id: int | None = None):
+    """
+    Select the merged unveiled area plus all pending fragments as one set.
+
+    `user_id` and `borough_id` may be plain values or columns of an
+    enclosing query, in which case the selects correlate to it.
+    """
+    fragments = (
+        select(UnveiledFragment.geometry.label("geometry"))
+        .where(
+            UnveiledFragment.user_id == user_id,
+            UnveiledFragment.borough_id == borough_id,
+        )
+        .correlate_except(UnveiledFragment)
+    )
+    if max_fragment_id is not None:
+        fragments = fragments.where(UnveiledFragment.id <= max_fragment_id)
+
+    return union_all(
+        select(UnveiledArea.geometry.label("geometry"))
+        .where(
+            UnveiledArea.user_id == user_id,
+            UnveiledArea.borough_id == borough_id,
+        )
+        .correlate_except(UnveiledArea),
+        fragments,
+    ).subquery()
+
+
+async def _lock_unveiled_area(session: AsyncSession, user_id: str, borough_id: int) -> None:
+    """
+    Serialize writers of one user's merged area in a borough until the end of
+    the current transaction.
+    """
+    await session.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"unveiled_area:{user_id}:{borough_id}")))
+    )
+
+
+async def _compact_fragments(session: AsyncSession, user_id: str, borough_id: int) -> None:
+    """
+    Merge pending fragments into the user's UnveiledArea in a single
+    cascaded union (ST_UnaryUnion over ST_Collect) and drop them.
+
+    Concurrent compactions for the same user and borough run one after the
+    other; a later one only sees the fragments the earlier one left behind.
+    """
+    await _lock_unveiled_area(session, user_id, borough_id)
+    result = await session.execute(
+        select(func.max(UnveiledFragment.id)).where(
+            UnveiledFragment.user_id == user_id,
+            UnveiledFragment.borough_id == borough_id,
+        )
+    )
+    max_fragment_id: int | None = result.scalar_one()
+    if max_fragment_id is None:
+        return
+
+    pieces = _unveiled_pieces(user_id, borough_id, max_fragment_id)
+    merged = select(
+        func.ST_QuantizeCoordinates(
+            func.ST_Multi(
+                func.ST_CollectionExtract(
+                    func.ST_UnaryUnion(func.ST_Collect(pieces.c.geometry)), 3
+                )
+            ),
+            COORDINATE_DECIMALS,
+        ).label("geometry")
+    ).subquery()
+
+    # The area is cached alongside the geometry in the same statement, so
+    # reads never need to measure the merged shape.
+    upsert = insert(UnveiledArea).from_select(
+        ["user_id", "borough_id", "geometry", "cached_area_m2"],
+        select(
+            literal(user_id, UnveiledArea.user_id.type),
+            literal(borough_id, UnveiledArea.borough_id.type),
+            merged.c.geometry,
+            _area_m2(merged.c.geometry),
+        ),
+    )
+    await session.execute(
+        upsert.on_conflict_do_update(
+            index_elements=["user_id", "borough_id"],
+            set_={
+                "geometry": upsert.excluded.geometry,
+                "cached_area_m2": upsert.excluded.cached_area_m2,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+    await session.execute(
+        delete(UnveiledFragment).where(
+            UnveiledFragment.user_id == user_id,
+            UnveiledFragment.borough_id == borough_id,
+            UnveiledFragment.id <= max_fragment_id,
+        )
+    )
+    await _rebuild_tiles(session, user_id, borough_id)
+    await session.commit()
+
+
+async def _rebuild_tiles(session: AsyncSession, user_id: str, borough_id: int) -> None:
+    """
+    Replace the user's tiles with a fresh ST_Subdivide of the merged area.
+
+    Takes the same lock as compaction (advisory locks nest within a
+    transaction), so two rebuilds never both insert a full tile set.
+    """
+    await _lock_unveiled_area(session, user_id, borough_id)
+    await session.execute(
+        delete(UnveiledAreaTile).where(
+            UnveiledAreaTile.user_id == user_id,
+            UnveiledAreaTile.borough_id == borough_id,
+        )
+    )
+    await session.execute(
+        insert(UnveiledAreaTile).from_select(
+            ["user_id", "borough_id", "geometry"],
+            select(
+                UnveiledArea.user_id,
+                UnveiledArea.borough_id,
+                func.ST_Subdivide(UnveiledArea.geometry, TILE_MAX_VERTICES),
+            ).where(
+                UnveiledArea.user_id == user_id,
+                UnveiledArea.borough_id == borough_id,
+            ),
+        )
+    )
+
+
+def _area_m2(geom):
+    """Area of a 4326 geometry in square meters, as used for borough areas."""
+    return func.ST_Area(func.ST_Transform(geom, 3857))
+
+
+def _unveiled_area_m2(user_id, borough_id):
+    """
+    Area in square meters of the merged unveiled area plus pending fragments.
+
+    The merged area's size is cached on UnveiledArea at compaction time. The
+    pending fragments are unioned among themselves only, and their overlap
+    with the merged area is subtracted using just the tiles whose bounding
+    boxes touch them (a GiST index lookup), so no union against the full
+    area is needed:
+
+        area(T ∪ F) = area(T) + area(F) - Σ area(t ∩ F) for t && F
+    """
+    merged_area = (
+        select(func.coalesce(func.sum(UnveiledArea.cached_area_m2), 0.0))
+        .where(
+            UnveiledArea.user_id == user_id,
+            UnveiledArea.borough_id == borough_id,
+        )
+        .correlate_except(UnveiledArea)
+        .scalar_subquery()
+    )
+
+    pending = (
+        select(
+            func.ST_UnaryUnion(func.ST_Collect(UnveiledFragment.geometry)).label("geometry")
+        )
+        .where(
+            UnveiledFragment.user_id == user_id,
+            UnveiledFragment.borough_id == borough_id,
+        )
+        .correlate_except(UnveiledFragment)
+        .subquery()
+    )
+    overlap_area = (
+        select(
+            func.coalesce(
+                func.sum(
+                    _area_m2(func.ST_Intersection(UnveiledAreaTile.geometry, pending.c.geometry))
+                ),
+                0.0,
+            )
+        )
+        .where(
+            UnveiledAreaTile.user_id == user_id,
+            UnveiledAreaTile.borough_id == borough_id,
+            UnveiledAreaTile.geometry.op("&&")(pending.c.geometry),
+        )
+        .correlate_except(UnveiledAreaTile)
+        .scalar_subquery()
+    )
+    pending_area = (
+        select(func.coalesce(_area_m2(pending.c.geometry), 0.0) - overlap_area)
+        .select_from(pending)
+        .scalar_subquery()
+    )
+
+    return merged_area + pending_area
+
 
 @router.get("/core-score", response_model=CoreScore)
 async def core_score(
@@ -17,44 +226,45 @@ async def core_score(
     """
     Return the user's core exploration score for their chosen borough.
     """
-    result = await session.execute(select(User).where(User.id == x_user_id))
-    user: User | None = result.scalar_one_or_none()
-    if user is None or user.chosen_borough_id is None:
-        raise RuntimeError("User or chosen borough not found")
-
-    result = await session.execute(
-        select(Borough).where(Borough.id == user.chosen_borough_id)
+    unveiled_area_expr = _unveiled_area_m2(User.id, User.chosen_borough_id)
+    fragment_count_expr = (
+        select(func.count(UnveiledFragment.id))
+        .where(
+            UnveiledFragment.user_id == User.id,
+            UnveiledFragment.borough_id == User.chosen_borough_id,
+        )
+        .scalar_subquery()
     )
-    borough: Borough | None = result.scalar_one_or_none()
-    if borough is None:
-        raise RuntimeError("Borough not found")
 
     result = await session.execute(
-        select(UnveiledArea).where(
-            UnveiledArea.user_id == user.id,
-            UnveiledArea.borough_id == borough.id,
+        select(User.chosen_borough_id, unveiled_area_expr, fragment_count_expr).where(
+            User.id == x_user_id
         )
     )
-    unveiled: UnveiledArea | None = result.scalar_one_or_none()
+    row = result.one_or_none()
+    if row is None or row[0] is None:
+        raise RuntimeError("User or chosen borough not found")
+
+    borough_id, unveiled_area, fragment_count = row
+    unveiled_area = float(unveiled_area or 0.0)
 
-    if unveiled is None:
-        unveiled_area = 0.0
-    else:
-        # Compute area using PostGIS ST_Area, with projection suitable for meters.
-        area_expr = func.ST_Area(func.ST_Transform(unveiled.geometry, 3857))
-        area_result = await session.execute(select(area_expr))
-        unveiled_area = float(area_result.scalar_one() or 0.0)
+    meta = await get_borough_meta(session, borough_id)
+    if meta is None:
+        raise RuntimeError("Borough not found")
+    borough_name, total_area = meta
+
+    # Compaction does not change the area, only how it is stored.
+    if fragment_count >= FRAGMENT_COMPACTION_THRESHOLD:
+        await _compact_fragments(session, x_user_id, borough_id)
 
     percent = 0.0
-    if borough.total_area > 0:
-        percent = (unveiled_area / borough.total_area) * 100.0
+    if total_area > 0:
+        percent = (unveiled_area / total_area) * 100.0
 
     return CoreScore(
-        borough_id=borough.id,
-        borough_name=borough.name,
+        borough_id=borough_id,
+        borough_name=borough_name,
         percent_explored=percent,
-        total_area=borough.total_area,
+        total_area=total_area,
         unveiled_area=unveiled_area,
     )
-
-
@@ -8,15 +8,99 @@ Usage:
 
 import asyncio
 
+from geoalchemy2 import Geometry
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
 # Import models so that all tables are registered on Base.metadata
 from .. import models  # noqa: F401
-from ..database import Base, engine
+from ..config import Settings
+from ..database import Base, get_engine
+from ..models import TILE_MAX_VERTICES
 
 
 async def _init() -> None:
+    engine = get_engine(Settings())
+    try:
+        await _create_schema(engine)
+    finally:
+        await engine.dispose()
+
+
+async def _create_schema(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+        # Timestamps are filled in by the database; tables created while they
+        # had Python-side defaults have no column default to fall back on.
+        for table, column in (
+            ("users", "created_at"),
+            ("activities", "created_at"),
+            ("unveiled_fragments", "created_at"),
+            ("unveiled_areas", "updated_at"),
+        ):
+            await conn.execute(
+                text(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()")
+            )
+
+        # Add and fill the cached area for unveiled areas created before it.
+        await conn.execute(
+            text(
+                "ALTER TABLE unveiled_areas "
+                "ADD COLUMN IF NOT EXISTS cached_area_m2 DOUBLE PRECISION NOT NULL DEFAULT 0"
+            )
+        )
+        await conn.execute(
+            text(
+                "UPDATE unveiled_areas "
+                "SET cached_area_m2 = ST_Area(ST_Transform(geometry, 3857)) "
+                "WHERE cached_area_m2 = 0"
+            )
+        )
+
+        # Databases created before the merged area was unique per user and
+        # borough only have a plain index; compaction upserts against this one.
+        await conn.execute(text("DROP INDEX IF EXISTS ix_unveiled_user_borough"))
+        await conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_unveiled_user_borough "
+                "ON unveiled_areas (user_id, borough_id)"
+            )
+        )
+
+        # Tile any unveiled areas merged before tiles existed.
+        await conn.execute(
+            text(
+                """
+                INSERT INTO unveiled_area_tiles (user_id, borough_id, geometry)
+                SELECT ua.user_id, ua.borough_id, ST_Subdivide(ua.geometry, :max_vertices)
+                FROM unveiled_areas ua
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM unveiled_area_tiles t
+                    WHERE t.user_id = ua.user_id AND t.borough_id = ua.borough_id
+                )
+                """
+            ),
+            {"max_vertices": TILE_MAX_VERTICES},
+        )
+
+    # `create_all` skips tables that already exist, so make sure databases
+    # created before the spatial indexes were declared get them too. CREATE
+    # INDEX CONCURRENTLY and ANALYZE cannot run inside a transaction block.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in Base.metadata.sorted_tables:
+            for column in table.columns:
+                if isinstance(column.type, Geometry):
+                    await conn.execute(
+                        text(
+                            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                            f"idx_{table.name}_{column.name} "
+                            f"ON {table.name} USING GIST ({column.name})"
+                        )
+                    )
+            await conn.execute(text(f"ANALYZE {table.name}"))
+
 
 def main() -> None:
     asyncio.run(_init())
@@ -24,5 +108,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
-
@@ -14,9 +14,11 @@ import sys
 from pathlib import Path
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
-from ..database import SessionLocal
+from ..config import Settings
+from ..database import get_engine, get_sessionmaker
+from ..models import COORDINATE_DECIMALS
 
 
 async def load_boroughs(geojson_path: Path) -> None:
@@ -28,44 +30,74 @@ async def load_boroughs(geojson_path: Path) -> None:
     if not features:
         raise SystemExit("No features found in GeoJSON.")
 
-    async with SessionLocal() as session:  # type: AsyncSession
-        for feature in features:
-            props = feature.get("properties", {})
-            # NYC open data sometimes uses different keys; support a few.
-            name = (
-                props.get("boro_name")
-                or props.get("boroname")
-                or props.get("name")
-            )
-            geom = json.dumps(feature.get("geometry"))
-            if not name or not geom:
-                continue
-
-            # Insert or update borough using PostGIS functions.
-            stmt = text(
-                """
-                INSERT INTO boroughs (name, geometry, total_area)
-                VALUES (
-                    :name,
-                    ST_SetSRID(ST_GeomFromGeoJSON(:geom)::geometry, 4326),
-                    ST_Area(
-                        ST_Transform(
-                            ST_SetSRID(ST_GeomFromGeoJSON(:geom)::geometry, 4326),
-                            3857
-                        )
-                    )
-                )
-                ON CONFLICT (name) DO UPDATE
-                SET
-                    geometry = EXCLUDED.geometry,
-                    total_area = EXCLUDED.total_area;
-                """
-            )
-            await session.execute(stmt, {"name": name, "geom": geom})
-
+    rows = []
+    for feature in features:
+        props = feature.get("properties", {})
+        # NYC open data sometimes uses different keys; support a few.
+        name = (
+            props.get("boro_name")
+            or props.get("boroname")
+            or props.get("name")
+        )
+        geometry = feature.get("geometry")
+        if not name or not geometry:
+            continue
+        rows.append(
+            {"name": name, "geom": json.dumps(geometry), "decimals": COORDINATE_DECIMALS}
+        )
+
+    if not rows:
+        raise SystemExit("No named features with geometry found in GeoJSON.")
+
+    engine = get_engine(Settings())
+    try:
+        await _upsert_boroughs(get_sessionmaker(engine), rows)
+        await _vacuum_analyze(engine)
+    finally:
+        await engine.dispose()
+
+
+# Insert or update a borough using PostGIS functions. The GeoJSON is parsed
+# once in the CTE and reused for both the stored geometry and its area.
+UPSERT_BOROUGH = text(
+    """
+    WITH g AS (
+        SELECT ST_QuantizeCoordinates(
+            ST_Multi(ST_SetSRID(ST_GeomFromGeoJSON(:geom), 4326)),
+            :decimals
+        ) AS geom
+    )
+    INSERT INTO boroughs (name, geometry, total_area)
+    SELECT
+        CAST(:name AS VARCHAR),
+        g.geom,
+        ST_Area(ST_Transform(g.geom, 3857))
+    FROM g
+    ON CONFLICT (name) DO UPDATE
+    SET
+        geometry = EXCLUDED.geometry,
+        total_area = EXCLUDED.total_area;
+    """
+)
+
+
+async def _upsert_boroughs(
+    sessionmaker: async_sessionmaker[AsyncSession], rows: list[dict[str, object]]
+) -> None:
+    # A list of parameter sets is sent as one batched executemany.
+    async with sessionmaker() as session:
+        await session.execute(UPSERT_BOROUGH, rows)
         await session.commit()
 
 
+async def _vacuum_analyze(engine: AsyncEngine) -> None:
+    """Refresh planner statistics for the freshly loaded geometries."""
+    # VACUUM cannot run inside a transaction block.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE boroughs"))
+
+
 def main(argv: list[str] | None = None) -> None:
     argv = list(sys.argv[1:] if argv is None else argv)
     if not argv:
@@ -1,22 +1,77 @@
+import argparse
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
 import logging
 import os
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Collection, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import httpx
-from notion_client import Client
+from notion_client import AsyncClient, Client
 from notion_client.errors import APIResponseError
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    _JSON_DECODE_ERRORS: Tuple[type, ...] = (orjson.JSONDecodeError, json.JSONDecodeError)
+except ImportError:  # pragma: no cover - orjson is optional for the sync script
+    def _loads(raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8"))
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Flattening is pure Python, so worker threads only help when the interpreter
+# runs without the GIL (3.13+ free-threaded builds); otherwise it stays serial.
+_FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - digests fall back to blake2b; see _simple_hash
+    xxhash = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - streaming is optional; see stream_tasks
+    ijson = None
+
 
 logger = logging.getLogger(__name__)
 
 
 DEFAULT_NOTION_ID_PROPERTY = "ID"
 
+# Key under which get_existing_pages stores each page's _simple_hash digest.
+SIMPLE_HASH_KEY = "_simple_hash"
+
+# Largest page the database query endpoint returns; fewer round-trips per sync.
+NOTION_QUERY_PAGE_SIZE = 100
+
+# Notion caps a compound filter at 100 conditions; small syncs query just
+# their own IDs instead of scanning the whole database.
+NOTION_FILTER_MAX_IDS = 100
+
+# Page writes are independent, so they are issued concurrently on one event loop.
+# Notion allows ~3 requests/s per integration: every request of a sync, query
+# or write, waits its turn on one shared _RateLimiter, so sends are spaced at
+# least this far apart however long each takes.
+NOTION_CONNECT_RETRIES = 3
+NOTION_REQUEST_INTERVAL = 0.34
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Task:
     id: str
     title: str
@@ -24,7 +79,7 @@ class Task:
     priority: str
     owner: str
     description: str
-    dependencies: List[str]
+    dependencies: FrozenSet[str]
     phase_name: str
     epic_title: str
 
@@ -33,17 +88,40 @@ class RoadmapLoadError(Exception):
     pass
 
 
+class _RateLimiter:
+    """
+    Spaces request sends at least `interval` seconds apart across every
+    coroutine sharing it, independent of round-trip time or concurrency.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = asyncio.Lock()
+        self._next_send = 0.0
+
+    async def wait(self) -> None:
+        """Returns once the caller may send its request."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_send - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_send = loop.time() + self._interval
+
+
 def load_local_roadmap(filepath: str) -> Dict[str, Any]:
     """
     Loads the roadmap.json file and returns its parsed content.
     Raises RoadmapLoadError on failure.
     """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # Read bytes and let orjson decode UTF-8 itself; avoids a separate str decode pass.
+        with open(filepath, "rb") as f:
+            raw = f.read()
+        data = _loads(raw)
     except FileNotFoundError as exc:
         raise RoadmapLoadError(f"Roadmap file not found at {filepath}") from exc
-    except json.JSONDecodeError as exc:
+    except _JSON_DECODE_ERRORS as exc:
         raise RoadmapLoadError(f"Could not decode JSON from {filepath}") from exc
 
     if not isinstance(data, dict):
@@ -77,56 +155,335 @@ def flatten_roadmap(roadmap_data: Dict[str, Any]) -> List[Task]:
     if not isinstance(phases, list):
         raise RoadmapLoadError("Expected 'phases' to be a list")
 
+    if _FREE_THREADED and len(phases) > 1:
+        # Phases are independent, so on a free-threaded interpreter they are
+        # flattened in parallel; map() keeps roadmap order.
+        with ThreadPoolExecutor(max_workers=min(len(phases), os.cpu_count() or 1)) as executor:
+            for phase_tasks in executor.map(_flatten_phase, phases):
+                tasks.extend(phase_tasks)
+        return tasks
+
     for phase in phases:
-        phase_name = phase.get("phaseName", "")
-        epics = phase.get("epics") or []
-        if not isinstance(epics, list):
-            raise RoadmapLoadError("Expected 'epics' to be a list in each phase")
-
-        for epic in epics:
-            epic_title = epic.get("epicTitle", "")
-            raw_tasks = epic.get("tasks") or []
-            if not isinstance(raw_tasks, list):
-                raise RoadmapLoadError("Expected 'tasks' to be a list in each epic")
-
-            for raw_task in raw_tasks:
-                task_id = (raw_task or {}).get("id")
-                title = (raw_task or {}).get("title")
-                if not task_id or not isinstance(task_id, str):
-                    logger.warning("Skipping task with invalid or missing id: %r", raw_task)
-                    continue
-                if not title or not isinstance(title, str):
-                    logger.warning("Skipping task with invalid or missing title: %r", raw_task)
-                    continue
-
-                status = (raw_task or {}).get("status", "Not Started")
-                priority = (raw_task or {}).get("priority", "Medium")
-                owner = (raw_task or {}).get("owner", "Unassigned")
-                description = (raw_task or {}).get("description", "")
-                dependencies = raw_task.get("dependencies") or []
-                if not isinstance(dependencies, list):
-                    logger.warning(
-                        "Task %s has non-list dependencies; coercing to empty list", task_id
-                    )
-                    dependencies = []
-
-                tasks.append(
-                    Task(
-                        id=task_id,
-                        title=title,
-                        status=status,
-                        priority=priority,
-                        owner=owner,
-                        description=description,
-                        dependencies=[str(d) for d in dependencies],
-                        phase_name=str(phase_name),
-                        epic_title=str(epic_title),
-                    )
-                )
+        tasks.extend(_iter_phase_tasks(phase))
 
     return tasks
 
 
+def _flatten_phase(phase: Dict[str, Any]) -> List[Task]:
+    return list(_iter_phase_tasks(phase))
+
+
+def _iter_phase_tasks(phase: Dict[str, Any]) -> Iterator[Task]:
+    phase_name = phase.get("phaseName", "")
+    epics = phase.get("epics") or []
+    if not isinstance(epics, list):
+        raise RoadmapLoadError("Expected 'epics' to be a list in each phase")
+
+    for epic in epics:
+        epic_title = epic.get("epicTitle", "")
+        raw_tasks = epic.get("tasks") or []
+        if not isinstance(raw_tasks, list):
+            raise RoadmapLoadError("Expected 'tasks' to be a list in each epic")
+
+        yield from _make_tasks(raw_tasks, phase_name, epic_title)
+
+
+def _checked_roadmap_events(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Passes on the ijson events of the root 'phases' value only, enforcing the
+    checks load_local_roadmap/flatten_roadmap make.
+
+    ijson prefixes join keys with dots, so a root key like "phases.item" or ""
+    is told apart by tracking nesting depth and the current root key instead.
+    """
+    depth = 0
+    root_key: Optional[str] = None
+    phases_seen = False
+    phases_map_opened = False
+    for prefix, event, value in events:
+        if depth == 0:
+            if event != "start_map":
+                raise RoadmapLoadError("Expected roadmap root to be an object")
+            depth = 1
+            continue
+        if depth == 1 and event == "map_key":
+            root_key = value
+            if root_key == "phases":
+                # A decoded document keeps only the last 'phases', but by then
+                # the stream has already yielded the earlier ones' tasks.
+                if phases_seen:
+                    raise RoadmapLoadError("Duplicate 'phases' key in roadmap")
+                phases_seen = True
+            continue
+        if depth == 1 and event == "end_map":
+            depth = 0
+            continue
+
+        in_phases = root_key == "phases"
+        if in_phases:
+            if depth == 1:
+                # Falsy values (null, "", 0, {}) count as no phases, as in flatten_roadmap.
+                phases_map_opened = event == "start_map"
+                if event not in ("start_array", "start_map") and value:
+                    raise RoadmapLoadError("Expected 'phases' to be a list")
+            elif phases_map_opened:
+                if depth != 2 or event != "end_map":
+                    raise RoadmapLoadError("Expected 'phases' to be a list")
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if in_phases:
+            yield prefix, event, value
+
+
+def stream_tasks(filepath: str) -> Iterator[Task]:
+    """
+    Parses the roadmap file and yields its Tasks, one phase at a time.
+
+    With ijson installed only the phase being flattened is held in memory,
+    rather than the whole decoded document; otherwise this falls back to
+    load_local_roadmap + flatten_roadmap. Raises RoadmapLoadError on failure.
+    """
+    if ijson is None:
+        yield from flatten_roadmap(load_local_roadmap(filepath))
+        return
+
+    try:
+        with open(filepath, "rb") as f:
+            events = _checked_roadmap_events(ijson.parse(f, use_float=True))
+            for phase in ijson.items(events, "phases.item"):
+                yield from _iter_phase_tasks(phase)
+    except FileNotFoundError as exc:
+        raise RoadmapLoadError(f"Roadmap file not found at {filepath}") from exc
+    except ijson.JSONError as exc:
+        raise RoadmapLoadError(f"Could not decode JSON from {filepath}") from exc
+
+
+def _make_tasks(
+    raw_tasks: List[Any],
+    phase_name: Any,
+    epic_title: Any,
+    _Task: type = Task,
+    _str: type = str,
+    _isinstance: Callable[..., bool] = isinstance,
+    _dict: type = dict,
+    _list: type = list,
+    _frozenset: type = frozenset,
+    _intern: Callable[[str], str] = sys.intern,
+    _all: Callable[[Iterable[Any]], bool] = all,
+    _filter: type = filter,
+    _warn: Callable[..., None] = logger.warning,
+) -> List[Task]:
+    """
+    Builds the Tasks for one epic. This is the per-task hot loop of
+    flatten_roadmap; globals and builtins are bound as default arguments so
+    they resolve as fast locals.
+
+    The low-cardinality fields (status, priority, owner, phase, epic) are
+    interned so repeated values share one string object.
+    """
+    # Sized for every raw task up front; skipped entries are trimmed at the end.
+    tasks: List[Any] = [None] * len(raw_tasks)
+    i = 0
+    phase_name = _intern(_str(phase_name))
+    epic_title = _intern(_str(epic_title))
+
+    for raw_task in raw_tasks:
+        if not _isinstance(raw_task, _dict):
+            _warn("Skipping task with invalid or missing id: %r", raw_task)
+            continue
+        g = raw_task.get
+        task_id = g("id")
+        title = g("title")
+        if not task_id or not _isinstance(task_id, _str):
+            _warn("Skipping task with invalid or missing id: %r", raw_task)
+            continue
+        if not title or not _isinstance(title, _str):
+            _warn("Skipping task with invalid or missing title: %r", raw_task)
+            continue
+
+        dependencies = g("dependencies") or []
+        if not _isinstance(dependencies, _list):
+            _warn("Task %s has non-list dependencies; coercing to empty list", task_id)
+            dependencies = []
+        if _all(type(d) is _str for d in dependencies):
+            # Already strings (the normal case): drop empties without a str() pass.
+            deps = _frozenset(_filter(None, dependencies))
+        else:
+            deps = _frozenset(_str(d) for d in dependencies if d)
+
+        status = g("status", "Not Started")
+        priority = g("priority", "Medium")
+        owner = g("owner", "Unassigned")
+        tasks[i] = _Task(
+            id=_intern(task_id),
+            title=title,
+            status=_intern(status) if _isinstance(status, _str) else status,
+            priority=_intern(priority) if _isinstance(priority, _str) else priority,
+            owner=_intern(owner) if _isinstance(owner, _str) else owner,
+            description=g("description", ""),
+            dependencies=deps,
+            phase_name=phase_name,
+            epic_title=epic_title,
+        )
+        i += 1
+
+    del tasks[i:]
+    return tasks
+
+
+def _parse_results(
+    results: List[Dict[str, Any]], id_property_name: str
+) -> Dict[str, Dict[str, Any]]:
+    """Maps one page of query results by their Task ID."""
+    page_map: Dict[str, Dict[str, Any]] = {}
+    intern = sys.intern
+
+    for page in results:
+        try:
+            # Missing keys fall through as None rather than allocating {} defaults.
+            properties = page.get("properties")
+            task_id_prop = properties.get(id_property_name) if properties else None
+            # Handle both Title and Rich Text types for the ID property
+            content_array = (
+                task_id_prop.get("title") or task_id_prop.get("rich_text")
+                if task_id_prop
+                else None
+            )
+
+            if not content_array:
+                # It might be empty, which is valid for a new row but we skip for sync matching
+                logger.warning(
+                    "Skipping page with ID %s - %s is empty",
+                    page.get("id"),
+                    id_property_name,
+                )
+                continue
+
+            task_id = content_array[0].get("plain_text")
+            if not task_id:
+                logger.warning(
+                    "Skipping page with ID %s - %s has no plain_text",
+                    page.get("id"),
+                    id_property_name,
+                )
+                continue
+            # Digest the comparable view once here, off the event loop;
+            # needs_update then compares one int per task.
+            page[SIMPLE_HASH_KEY] = _simple_hash(_simple_property_view(properties, id_property_name))
+            # plain_text is always a string; interned to match Task.id, so
+            # lookups hit on identity.
+            page_map[intern(task_id)] = page
+        except Exception:
+            logger.exception("Skipping page with ID %s due to parsing error", page.get("id"))
+
+    return page_map
+
+
+async def _iter_existing_pages_async(
+    auth: str,
+    database_id: str,
+    id_property_name: str,
+    task_ids: Optional[Collection[str]] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+    rate_limiter: Optional[_RateLimiter] = None,
+) -> AsyncIterator[Dict[str, Dict[str, Any]]]:
+    """
+    Walks the database query cursor, yielding each response's pages mapped by
+    Task ID (see _parse_results). Each response is parsed in a worker thread
+    while the request for the next one is in flight.
+
+    When at most NOTION_FILTER_MAX_IDS task_ids are given, only pages whose ID
+    matches one of them are requested; otherwise the whole database is scanned.
+
+    Requests go through http_client when given (its connection pool is shared
+    with the caller's other requests); otherwise a client is opened and closed
+    here. URL and headers are absolute per request, so a client configured
+    for notion-client works too. Each request first waits on rate_limiter,
+    when given.
+    """
+    has_more = True
+    start_cursor: Optional[str] = None
+    pending: Optional["asyncio.Task[Dict[str, Dict[str, Any]]]"] = None
+
+    # Ensure body is not empty to avoid 400 Bad Request on newer API versions.
+    # Built once; only start_cursor changes between pages.
+    json_body: Dict[str, Any] = {"page_size": NOTION_QUERY_PAGE_SIZE}
+    if task_ids and len(task_ids) <= NOTION_FILTER_MAX_IDS:
+        # ID is Rich Text in this DB (see _compared_properties).
+        json_body["filter"] = {
+            "or": [
+                {"property": id_property_name, "rich_text": {"equals": task_id}}
+                for task_id in task_ids
+            ]
+        }
+
+    # Fallback to direct httpx call to bypass notion-client issues with this specific endpoint
+    url = f"https://api.notion.com/v1/databases/{database_id}/query"
+    headers = {
+        "Authorization": f"Bearer {auth}",
+        "Notion-Version": "2022-06-28", # Force older version to avoid invalid_request_url 400 error
+        "Content-Type": "application/json",
+    }
+
+    # One keep-alive connection serves every page (HTTP/2 when h2 is installed).
+    owns_client = http_client is None
+    if http_client is None:
+        http_client = httpx.AsyncClient(http2=_HTTP2_AVAILABLE)
+    try:
+        while has_more:
+            try:
+                if start_cursor:
+                    json_body["start_cursor"] = start_cursor
+
+                if rate_limiter is not None:
+                    await rate_limiter.wait()
+                # Encode/decode with orjson; Content-Type is set in headers.
+                http_response = await http_client.post(
+                    url, content=_dumps(json_body), headers=headers, timeout=60.0
+                )
+                http_response.raise_for_status()
+                response = _loads(http_response.content)
+
+            except httpx.HTTPStatusError as e:
+                logger.error("Error fetching existing pages (HTTP %s): %s", e.response.status_code, e.response.text)
+                raise APIResponseError(e.response, e.response.text, str(e.response.status_code)) from e
+            except Exception as e:
+                logger.error("Error fetching existing pages: %s", e)
+                raise
+
+            # Parse this page off the event loop; it is yielded once the next
+            # request has been answered, so parsing overlaps the round-trip.
+            parsing = asyncio.create_task(
+                asyncio.to_thread(_parse_results, response.get("results", []), id_property_name)
+            )
+            if pending is not None:
+                yield await pending
+            pending = parsing
+
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
+
+        if pending is not None:
+            yield await pending
+    finally:
+        if owns_client:
+            await http_client.aclose()
+
+
+async def _get_existing_pages_async(
+    auth: str,
+    database_id: str,
+    id_property_name: str,
+) -> Dict[str, Dict[str, Any]]:
+    page_map: Dict[str, Dict[str, Any]] = {}
+    # Batches arrive in request order, so later pages win on duplicate IDs as before.
+    async for partial in _iter_existing_pages_async(auth, database_id, id_property_name):
+        page_map.update(partial)
+    return page_map
+
+
 def get_existing_pages(
     notion_client: Client,
     database_id: str,
@@ -138,93 +495,56 @@ def get_existing_pages(
     Returns:
         Dict[task_id, page_object]
     """
-    page_map: Dict[str, Dict[str, Any]] = {}
-    has_more = True
-    start_cursor: Optional[str] = None
+    return asyncio.run(
+        _get_existing_pages_async(notion_client.options.auth, database_id, id_property_name)
+    )
 
-    while has_more:
-        try:
-            # Fallback to direct httpx call to bypass notion-client issues with this specific endpoint
-            url = f"https://api.notion.com/v1/databases/{database_id}/query"
-            headers = {
-                "Authorization": f"Bearer {notion_client.options.auth}",
-                "Notion-Version": "2022-06-28", # Force older version to avoid invalid_request_url 400 error
-                "Content-Type": "application/json",
-            }
-            
-            # Ensure body is not empty to avoid 400 Bad Request on newer API versions
-            json_body = {"page_size": 100}
-            if start_cursor:
-                json_body["start_cursor"] = start_cursor
-
-            # Use httpx.Client() context manager to ensure proper cleanup if we were doing this repeatedly,
-            # but here a simple post is fine.
-            # Note: notion_client uses httpx under the hood, so we reuse the library.
-
-            http_response = httpx.post(url, headers=headers, json=json_body, timeout=60.0)
-            http_response.raise_for_status()
-            response = http_response.json()
-
-        except httpx.HTTPStatusError as e:
-            logger.error("Error fetching existing pages (HTTP %s): %s", e.response.status_code, e.response.text)
-            raise APIResponseError(e.response, e.response.text, str(e.response.status_code)) from e
-        except Exception as e:
-            logger.error("Error fetching existing pages: %s", e)
-            raise
-
-        results = response.get("results", [])
-
-        for page in results:
-            try:
-                properties = page.get("properties", {})
-                task_id_prop = properties.get(id_property_name, {})
-                # Handle both Title and Rich Text types for the ID property
-                content_array = task_id_prop.get("title") or task_id_prop.get("rich_text") or []
-                
-                if not content_array:
-                    # It might be empty, which is valid for a new row but we skip for sync matching
-                    logger.warning(
-                        "Skipping page with ID %s - %s is empty",
-                        page.get("id"),
-                        id_property_name,
-                    )
-                    continue
-                    
-                task_id = content_array[0].get("plain_text")
-                if not task_id:
-                    logger.warning(
-                        "Skipping page with ID %s - %s has no plain_text",
-                        page.get("id"),
-                        id_property_name,
-                    )
-                    continue
-                page_map[str(task_id)] = page
-            except Exception:
-                logger.exception("Skipping page with ID %s due to parsing error", page.get("id"))
 
-        has_more = response.get("has_more", False)
-        start_cursor = response.get("next_cursor")
+def _dependencies_to_multi_select(dependencies: Iterable[str]) -> List[Dict[str, str]]:
+    # Sorted once at serialization so payloads are deterministic.
+    return [{"name": d} for d in sorted(dependencies) if d]
+
 
-    return page_map
+def _text_node(content: str) -> Dict[str, Any]:
+    return {"type": "text", "text": {"content": content}}
 
 
-def _dependencies_to_multi_select(dependencies: Iterable[str]) -> List[Dict[str, str]]:
-    return [{"name": d} for d in dependencies if d]
+def _rich_text(content: str) -> List[Dict[str, Any]]:
+    # Notion stores an empty rich_text as [], and _from_rich_text reads both as "".
+    return [_text_node(content)] if content else []
+
+
+def _phase_epic_properties(phase_name: str, epic_title: str) -> Dict[str, Any]:
+    return {
+        "Phase": {
+            "select": {"name": phase_name},
+        },
+        "Epic": {
+            "select": {"name": epic_title},
+        },
+    }
 
 
 def format_notion_properties(
-    task: Task, id_property_name: str = DEFAULT_NOTION_ID_PROPERTY
+    task: Task,
+    id_property_name: str = DEFAULT_NOTION_ID_PROPERTY,
+    base: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Formats a Task into the Notion API's property structure.
+
+    ``base`` may carry the Phase/Epic properties shared by every task in an
+    epic (see _phase_epic_properties); the nested dicts are reused, not copied.
     """
+    if base is None:
+        base = _phase_epic_properties(task.phase_name, task.epic_title)
     return {
         # Primary key / title property
         id_property_name: {
-            "rich_text": [{"type": "text", "text": {"content": task.id}}],
+            "rich_text": [_text_node(task.id)],
         },
         "Task Name": {
-            "title": [{"type": "text", "text": {"content": task.title}}],
+            "title": [_text_node(task.title)],
         },
         "Status": {
             "status": {"name": task.status},
@@ -237,100 +557,122 @@ def format_notion_properties(
         "Owner": {
             "select": {"name": task.owner},
         },
-        "Phase": {
-            "select": {"name": task.phase_name},
-        },
-        "Epic": {
-            "select": {"name": task.epic_title},
-        },
+        **base,
         "Description": {
-            "rich_text": [
-                {"type": "text", "text": {"content": task.description or ""}},
-            ],
+            "rich_text": _rich_text(task.description or ""),
         },
         "Dependencies": {
-            "rich_text": [
-                {"type": "text", "text": {"content": ", ".join(task.dependencies)}},
-            ],
+            "rich_text": _rich_text(", ".join(sorted(task.dependencies))),
         },
     }
 
 
-def _simple_property_view(properties: Dict[str, Any], id_property_name: str) -> Dict[str, Any]:
-    """
-    Extracts a simplified, comparable view of relevant properties from either:
-      - a Notion page's properties dict, or
-      - a Notion properties payload about to be sent.
-    """
+def _from_title(prop: Dict[str, Any]) -> str:
+    arr = prop.get("title") or []
+    if not arr:
+        return ""
+    return arr[0].get("plain_text") or arr[0].get("text", {}).get("content", "")
+
+
+def _from_rich_text(prop: Dict[str, Any]) -> str:
+    arr = prop.get("rich_text") or []
+    if not arr:
+        return ""
+    if len(arr) == 1:
+        # Pages written by this sync always hold a single span.
+        span = arr[0]
+        return span.get("plain_text") or span.get("text", {}).get("content", "") or ""
+    return "".join(
+        [
+            span.get("plain_text")
+            or span.get("text", {}).get("content", "")
+            or ""
+            for span in arr
+        ]
+    )
 
-    def _from_title(prop: Dict[str, Any]) -> str:
-        arr = prop.get("title") or []
-        if not arr:
-            return ""
-        return arr[0].get("plain_text") or arr[0].get("text", {}).get("content", "")
-
-    def _from_rich_text(prop: Dict[str, Any]) -> str:
-        arr = prop.get("rich_text") or []
-        if not arr:
-            return ""
-        return "".join(
-            [
-                span.get("plain_text")
-                or span.get("text", {}).get("content", "")
-                or ""
-                for span in arr
-            ]
-        )
 
-    def _from_select(prop: Dict[str, Any]) -> str:
-        select = prop.get("select") or {}
-        return select.get("name", "") if isinstance(select, dict) else ""
+def _from_select(prop: Dict[str, Any]) -> str:
+    select = prop.get("select") or {}
+    return select.get("name", "") if isinstance(select, dict) else ""
 
-    def _from_multi_select(prop: Dict[str, Any]) -> Tuple[str, ...]:
-        items = prop.get("multi_select") or []
-        names: List[str] = []
-        for item in items:
-            name = item.get("name")
-            if name:
-                names.append(name)
-        return tuple(sorted(names))
 
-    def _from_status(prop: Dict[str, Any]) -> str:
-        status = prop.get("status") or {}
-        return status.get("name", "") if isinstance(status, dict) else ""
+def _from_multi_select(prop: Dict[str, Any]) -> FrozenSet[str]:
+    # multi_select is set-valued in Notion, so compare as a set rather than sorting.
+    items = prop.get("multi_select") or []
+    return frozenset(name for item in items if (name := item.get("name")))
 
-    simple: Dict[str, Any] = {}
-    
-    # Primary ID is Rich Text in this specific DB
-    id_prop = properties.get(id_property_name) or {}
-    simple[id_property_name] = _from_rich_text(id_prop)
 
-    title = properties.get("Task Name") or {}
-    simple["Task Name"] = _from_title(title)
+def _from_status(prop: Dict[str, Any]) -> str:
+    status = prop.get("status") or {}
+    return status.get("name", "") if isinstance(status, dict) else ""
+
+
+# Compared properties (besides the ID) and how to extract a comparable value
+# from each; shared by _simple_property_view and needs_update. Ordered by how
+# often they drift between syncs, so needs_update tends to stop early.
+_COMPARED_PROPERTIES: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = (
+    ("Description", _from_rich_text),
+    # Dependencies is Rich Text in this DB
+    ("Dependencies", _from_rich_text),
+    ("Status", _from_status),
+    ("Priority", _from_select),
+    ("Owner", _from_select),
+    ("Phase", _from_select),
+    ("Epic", _from_select),
+    ("Task Name", _from_title),
+)
 
-    status = properties.get("Status") or {}
-    simple["Status"] = _from_status(status)
 
-    priority = properties.get("Priority") or {}
-    simple["Priority"] = _from_select(priority)
+def _compared_properties(
+    id_property_name: str,
+) -> Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...]:
+    # Primary ID is Rich Text in this specific DB. Pages are matched by ID, so
+    # it is compared last.
+    return _COMPARED_PROPERTIES + ((id_property_name, _from_rich_text),)
 
-    owner = properties.get("Owner") or {}
-    simple["Owner"] = _from_select(owner)
 
-    phase = properties.get("Phase") or {}
-    simple["Phase"] = _from_select(phase)
+def _simple_property_view(properties: Dict[str, Any], id_property_name: str) -> Dict[str, Any]:
+    """
+    Extracts a simplified, comparable view of relevant properties from either:
+      - a Notion page's properties dict, or
+      - a Notion properties payload about to be sent.
+    """
+    return {
+        name: extract(properties.get(name) or {})
+        for name, extract in _compared_properties(id_property_name)
+    }
 
-    epic = properties.get("Epic") or {}
-    simple["Epic"] = _from_select(epic)
 
-    description = properties.get("Description") or {}
-    simple["Description"] = _from_rich_text(description)
+def _task_simple_view(task: Task, id_property_name: str) -> Dict[str, Any]:
+    """
+    The _simple_property_view of format_notion_properties(task), built
+    straight from the Task's fields (same keys, same order) so an unchanged task
+    never needs its Notion payload built.
+    """
+    return {
+        "Description": task.description or "",
+        "Dependencies": ", ".join(sorted(task.dependencies)),
+        "Status": task.status,
+        "Priority": task.priority,
+        "Owner": task.owner,
+        "Phase": task.phase_name,
+        "Epic": task.epic_title,
+        "Task Name": task.title,
+        id_property_name: task.id,
+    }
 
-    deps = properties.get("Dependencies") or {}
-    # Dependencies is Rich Text in this DB
-    simple["Dependencies"] = _from_rich_text(deps)
 
-    return simple
+def _simple_hash(simple: Dict[str, Any]) -> int:
+    """
+    Digest of a _simple_property_view result. Views are built in a fixed key
+    order, so equal views always digest equally, and the digest is stable
+    across processes.
+    """
+    encoded = _dumps(simple)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(encoded)
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
 
 
 def needs_update(
@@ -341,11 +683,50 @@ def needs_update(
     """
     Compares the relevant properties between an existing Notion page and a new
     properties payload and decides whether an update is needed.
+
+    Pages fetched by get_existing_pages carry a precomputed digest of their
+    view, so only the new payload's view is built and hashed. Otherwise fields
+    are compared one at a time and the first mismatch short-circuits.
     """
+    digest = existing_page.get(SIMPLE_HASH_KEY)
+    if digest is not None:
+        return digest != _simple_hash(_simple_property_view(new_properties, id_property_name))
+
     existing_props = existing_page.get("properties") or {}
-    simple_existing = _simple_property_view(existing_props, id_property_name)
-    simple_new = _simple_property_view(new_properties, id_property_name)
-    return simple_existing != simple_new
+    for name, extract in _compared_properties(id_property_name):
+        if extract(existing_props.get(name) or {}) != extract(new_properties.get(name) or {}):
+            return True
+    return False
+
+
+class _OrjsonAsyncClient(AsyncClient):
+    """
+    notion-client AsyncClient whose JSON request bodies are encoded with orjson.
+
+    Only request construction is overridden, so the SDK's retry and error
+    handling still apply; multipart and explicit-auth requests are left to it.
+    _build_request is private, so notion-client is pinned to the 3.x line
+    whose signature this matches.
+    """
+
+    def _build_request(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[Any, Any]] = None,
+        body: Optional[Dict[Any, Any]] = None,
+        form_data: Optional[Dict[Any, Any]] = None,
+        auth: Optional[Union[str, Dict[str, str]]] = None,
+    ) -> httpx.Request:
+        if body is None or form_data or auth:
+            return super()._build_request(method, path, query, body, form_data, auth)
+        return self.client.build_request(
+            method,
+            path,
+            params=query,
+            content=_dumps(body),
+            headers={"Content-Type": "application/json"},
+        )
 
 
 class SyncStats:
@@ -364,29 +745,32 @@ class SyncStats:
         }
 
 
-def create_notion_page(
-    notion_client: Client,
+async def create_notion_page(
+    notion_client: AsyncClient,
     database_id: str,
     properties: Dict[str, Any],
     id_property_name: str = DEFAULT_NOTION_ID_PROPERTY,
     dry_run: bool = False,
-) -> None:
-    """Creates a new page in the Notion database."""
+) -> Optional[str]:
+    """Creates a new page in the Notion database and returns its page ID."""
     task_id = properties[id_property_name]["rich_text"][0]["text"]["content"]
     if dry_run:
         logger.info("DRY-RUN: Would create %s", task_id)
-        return
+        return None
 
     try:
-        notion_client.pages.create(parent={"database_id": database_id}, properties=properties)
+        page = await notion_client.pages.create(
+            parent={"database_id": database_id}, properties=properties
+        )
         logger.info("CREATED: %s", task_id)
+        return page.get("id")
     except APIResponseError as e:
         logger.error("Error creating %s: %s (status=%s)", task_id, e, e.status)
         raise
 
 
-def update_notion_page(
-    notion_client: Client,
+async def update_notion_page(
+    notion_client: AsyncClient,
     page_id: str,
     properties: Dict[str, Any],
     id_property_name: str = DEFAULT_NOTION_ID_PROPERTY,
@@ -399,95 +783,168 @@ def update_notion_page(
         return
 
     try:
-        notion_client.pages.update(page_id=page_id, properties=properties)
+        await notion_client.pages.update(page_id=page_id, properties=properties)
         logger.info("UPDATED: %s", task_id)
     except APIResponseError as e:
         logger.error("Error updating %s: %s (status=%s)", task_id, e, e.status)
         raise
 
 
-def sync_roadmap_to_notion(
+async def _sync_tasks_async(
     *,
     notion_api_key: str,
     notion_database_id: str,
-    roadmap_file_path: str,
-    id_property_name: str = DEFAULT_NOTION_ID_PROPERTY,
-    dry_run: bool = False,
+    tasks: List[Task],
+    id_property_name: str,
+    dry_run: bool,
 ) -> SyncStats:
     """
-    High-level sync function.
+    Streams existing pages from Notion and issues the needed creates/updates
+    concurrently, starting updates before pagination has finished.
     """
-    if not notion_api_key:
-        raise ValueError("NOTION_API_KEY is required")
-    if not notion_database_id:
-        raise ValueError("NOTION_DATABASE_ID is required")
-
-    client = Client(auth=notion_api_key)
-
-    logger.info("Loading local roadmap from %s", roadmap_file_path)
-    roadmap_data = load_local_roadmap(roadmap_file_path)
-    tasks = flatten_roadmap(roadmap_data)
-    logger.info("Loaded %d tasks from roadmap", len(tasks))
-
-    logger.info("Fetching existing pages from Notion...")
-    existing_pages = get_existing_pages(client, notion_database_id, id_property_name)
-    logger.info("Found %d existing tasks in Notion", len(existing_pages))
-
-    stats = SyncStats()
-
+    rate_limiter = _RateLimiter(NOTION_REQUEST_INTERVAL)
+    phase_epic_bases: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    writes: List["asyncio.Task[str]"] = []
+    written: List[Task] = []
+    skipped = 0
+
+    # Tasks not yet matched to an existing page, by ID, in roadmap order.
+    unmatched: Dict[str, List[Task]] = {}
     for task in tasks:
-        properties = format_notion_properties(task, id_property_name)
-        page = existing_pages.get(task.id)
-
-        # Existing page -> update if needed
-        if page:
-            if needs_update(page, properties, id_property_name):
-                try:
-                    update_notion_page(
+        unmatched.setdefault(task.id, []).append(task)
+
+    # One connection pool per run serves both the query and every write
+    # (multiplexed over HTTP/2 when h2 is installed); notion-client fills in
+    # base URL, headers and timeout. It is bound to this run's event loop, so it
+    # is not kept across sync_roadmap_to_notion calls.
+    transport = httpx.AsyncHTTPTransport(http2=_HTTP2_AVAILABLE, retries=NOTION_CONNECT_RETRIES)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = _OrjsonAsyncClient(auth=notion_api_key, client=http_client)
+
+        async def _write_task(task: Task, properties: Dict[str, Any], page_id: Optional[str]) -> str:
+            """Creates or updates one task's page; returns the SyncStats field to bump."""
+            if not dry_run:
+                await rate_limiter.wait()
+            try:
+                # Existing page -> update
+                if page_id:
+                    await update_notion_page(
                         client,
-                        page_id=page["id"],
+                        page_id=page_id,
                         properties=properties,
                         id_property_name=id_property_name,
                         dry_run=dry_run,
                     )
-                    stats.updated += 1
-                except APIResponseError:
-                    stats.failed += 1
-            else:
-                logger.info("SKIP (no changes): %s", task.id)
-                stats.skipped += 1
-        else:
-            try:
-                create_notion_page(
+                    return "updated"
+                await create_notion_page(
                     client,
                     database_id=notion_database_id,
                     properties=properties,
                     id_property_name=id_property_name,
                     dry_run=dry_run,
                 )
-                stats.created += 1
+                return "created"
             except APIResponseError:
-                stats.failed += 1
+                return "failed"
+
+        def _schedule_write(task: Task, page_id: Optional[str]) -> None:
+            # Phase/Epic properties are built once per epic and shared.
+            key = (task.phase_name, task.epic_title)
+            base = phase_epic_bases.get(key)
+            if base is None:
+                base = phase_epic_bases[key] = _phase_epic_properties(*key)
+            properties = format_notion_properties(task, id_property_name, base)
+            writes.append(asyncio.create_task(_write_task(task, properties, page_id)))
+            written.append(task)
+
+        # Updates start as soon as a task's page is seen, while later query
+        # pages are still in flight. Fetched pages carry a digest of their view,
+        # so an unchanged task is recognized from its own fields and its Notion
+        # payload is never built.
+        existing_ids: Set[str] = set()
+        if unmatched:
+            logger.info("Fetching existing pages from Notion...")
+            async for batch in _iter_existing_pages_async(
+                notion_api_key,
+                notion_database_id,
+                id_property_name,
+                task_ids=list(unmatched),
+                http_client=http_client,
+                rate_limiter=rate_limiter,
+            ):
+                existing_ids.update(batch)
+                for task_id, page in batch.items():
+                    for task in unmatched.pop(task_id, ()):
+                        if page.get(SIMPLE_HASH_KEY) == _simple_hash(
+                            _task_simple_view(task, id_property_name)
+                        ):
+                            logger.info("SKIP (no changes): %s", task.id)
+                            skipped += 1
+                        else:
+                            _schedule_write(task, page["id"])
+            logger.info("Found %d existing tasks in Notion", len(existing_ids))
+
+        # Only once the cursor is drained is it known which tasks have no page.
+        for pending_tasks in unmatched.values():
+            for task in pending_tasks:
+                _schedule_write(task, None)
+
+        # An unexpected error in one write (timeouts, transport errors past the
+        # retries) does not cancel the others.
+        outcomes = await asyncio.gather(*writes, return_exceptions=True)
+
+    written_counts = {"created": 0, "updated": 0, "failed": 0}
+    for task, outcome in zip(written, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Error syncing %s: %s", task.id, outcome, exc_info=outcome)
+            outcome = "failed"
+        written_counts[outcome] += 1
 
+    stats = SyncStats()
+    stats.created = written_counts["created"]
+    stats.updated = written_counts["updated"]
+    stats.skipped = skipped
+    stats.failed = written_counts["failed"]
     return stats
 
 
-def main_from_env_and_args(argv: Optional[List[str]] = None) -> int:
+def sync_roadmap_to_notion(
+    *,
+    notion_api_key: str,
+    notion_database_id: str,
+    roadmap_file_path: str,
+    id_property_name: str = DEFAULT_NOTION_ID_PROPERTY,
+    dry_run: bool = False,
+) -> SyncStats:
     """
-    Entry helper for CLI: reads env vars and arguments, runs sync, and
-    returns a process exit code.
+    High-level sync function.
     """
-    import argparse
+    if not notion_api_key:
+        raise ValueError("NOTION_API_KEY is required")
+    if not notion_database_id:
+        raise ValueError("NOTION_DATABASE_ID is required")
 
-    # Load from .env if present
-    try:
-        from dotenv import load_dotenv
+    logger.info("Loading local roadmap from %s", roadmap_file_path)
+    tasks = list(stream_tasks(roadmap_file_path))
+    logger.info("Loaded %d tasks from roadmap", len(tasks))
+
+    return asyncio.run(
+        _sync_tasks_async(
+            notion_api_key=notion_api_key,
+            notion_database_id=notion_database_id,
+            tasks=tasks,
+            id_property_name=id_property_name,
+            dry_run=dry_run,
+        )
+    )
 
-        load_dotenv()
-    except Exception:
-        # It's okay if python-dotenv is not installed; env vars may still be set.
-        pass
 
+@functools.lru_cache(maxsize=1)
+def _parser() -> argparse.ArgumentParser:
+    """
+    Builds the CLI parser once per process. Env-var defaults are read on the
+    first call, i.e. after main_from_env_and_args has loaded .env.
+    """
     parser = argparse.ArgumentParser(description="Sync roadmap.json tasks into a Notion database.")
     parser.add_argument(
         "--database-id",
@@ -518,8 +975,24 @@ def main_from_env_and_args(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Enable debug logging.",
     )
+    return parser
 
-    args = parser.parse_args(argv)
+
+def main_from_env_and_args(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry helper for CLI: reads env vars and arguments, runs sync, and
+    returns a process exit code.
+    """
+    # Load from .env if present
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except Exception:
+        # It's okay if python-dotenv is not installed; env vars may still be set.
+        pass
+
+    args = _parser().parse_args(argv)
 
     # Configure logging
     logging.basicConfig(
@@ -551,7 +1024,11 @@ def main_from_env_and_args(argv: Optional[List[str]] = None) -> int:
     # We will assume the provided ID is correct for now, but log a warning if it looks like a page ID.
     
     if len(notion_database_id) == 32 and "-" not in notion_database_id:
-         notion_database_id = f"{notion_database_id[:8]}-{notion_database_id[8:12]}-{notion_database_id[12:16]}-{notion_database_id[16:20]}-{notion_database_id[20:]}"
+        try:
+            notion_database_id = str(uuid.UUID(notion_database_id))
+        except ValueError:
+            logger.error("NOTION_DATABASE_ID %r is not a valid Notion ID.", notion_database_id)
+            return 1
 
     try:
         stats = sync_roadmap_to_notion(
@@ -0,0 +1,16 @@
+import re
+
+from sqlalchemy.dialects import postgresql
+
+from backend.routes.activities import _batch_fragments_insert
+from backend.schemas import CheckinRequest
+
+
+def test_batch_fragments_insert_names_unnest_columns():
+    payload = [CheckinRequest(latitude=40.71, longitude=-73.96)]
+    sql = str(_batch_fragments_insert("u1", 3, payload).compile(dialect=postgresql.dialect()))
+
+    alias = re.search(r"FROM unnest\(.*?\) AS (\w+)\(longitude, latitude\)", sql)
+    assert alias is not None
+    assert f"{alias.group(1)}.longitude" in sql
+    assert f"{alias.group(1)}.latitude" in sql
@@ -1,15 +1,66 @@
+import asyncio
+import copy
 import json
 from pathlib import Path
 
 import pytest
 
+import httpx
+
+from notion_sync import core
 from notion_sync.core import (
+    RoadmapLoadError,
     Task,
+    _OrjsonAsyncClient,
+    _RateLimiter,
     _simple_property_view,
+    _task_simple_view,
     flatten_roadmap,
     format_notion_properties,
+    load_local_roadmap,
     needs_update,
+    stream_tasks,
+)
+
+
+def test_load_local_roadmap_parses_utf8(tmp_path: Path):
+    path = tmp_path / "roadmap.json"
+    path.write_bytes(json.dumps({"phases": [{"phaseName": "Fase é"}]}, ensure_ascii=False).encode("utf-8"))
+
+    assert load_local_roadmap(str(path)) == {"phases": [{"phaseName": "Fase é"}]}
+
+
+@pytest.mark.parametrize("content", [b"{not json", b"[1, 2]", b"\xff\xfe"])
+def test_load_local_roadmap_rejects_bad_content(tmp_path: Path, content: bytes):
+    path = tmp_path / "roadmap.json"
+    path.write_bytes(content)
+
+    with pytest.raises(RoadmapLoadError):
+        load_local_roadmap(str(path))
+
+
+def test_stream_tasks_rejects_duplicate_phases(tmp_path: Path):
+    pytest.importorskip("ijson")
+    path = tmp_path / "roadmap.json"
+    path.write_bytes(b'{"phases": [], "phases": []}')
+
+    with pytest.raises(RoadmapLoadError):
+        list(stream_tasks(str(path)))
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"phases.item": {"epics": [{"tasks": [{"id": "X", "title": "ghost"}]}]}},
+        {"phases": [{"epics": [{"tasks": [{"id": "T1", "title": "Task 1"}]}]}], "": 1},
+    ],
 )
+def test_stream_tasks_matches_flatten_roadmap(tmp_path: Path, document):
+    pytest.importorskip("ijson")
+    path = tmp_path / "roadmap.json"
+    path.write_bytes(json.dumps(document).encode("utf-8"))
+
+    assert list(stream_tasks(str(path))) == flatten_roadmap(load_local_roadmap(str(path)))
 
 
 def test_flatten_roadmap_basic():
@@ -48,11 +99,44 @@ def test_flatten_roadmap_basic():
     assert t.priority == "High"
     assert t.owner == "Alex"
     assert t.description == "First task"
-    assert t.dependencies == ["T0"]
+    assert t.dependencies == frozenset({"T0"})
     assert t.phase_name == "Phase 1"
     assert t.epic_title == "Epic A"
 
 
+def test_flatten_roadmap_parallel_path_matches_serial(monkeypatch):
+    roadmap = {
+        "phases": [
+            {
+                "phaseName": f"Phase {p}",
+                "epics": [
+                    {
+                        "epicTitle": f"Epic {p}{e}",
+                        "tasks": [{"id": f"T{p}{e}{t}", "title": f"Task {t}"} for t in range(3)],
+                    }
+                    for e in range(2)
+                ],
+            }
+            for p in range(4)
+        ]
+    }
+    serial = flatten_roadmap(roadmap)
+
+    executors = []
+
+    class RecordingExecutor(core.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    monkeypatch.setattr(core, "_FREE_THREADED", True)
+    monkeypatch.setattr(core, "ThreadPoolExecutor", RecordingExecutor)
+
+    assert flatten_roadmap(roadmap) == serial
+    assert len(executors) == 1
+    assert len(serial) == 24
+
+
 def test_flatten_roadmap_skips_invalid_tasks(caplog):
     roadmap = {
         "phases": [
@@ -87,7 +171,7 @@ def test_format_notion_properties_round_trip_simplified():
         priority="High",
         owner="Alex",
         description="First task",
-        dependencies=["T0", "T2"],
+        dependencies=frozenset({"T0", "T2"}),
         phase_name="Phase 1",
         epic_title="Epic A",
     )
@@ -115,7 +199,7 @@ def test_needs_update_detects_changes():
         priority="High",
         owner="Alex",
         description="First task",
-        dependencies=["T0"],
+        dependencies=frozenset({"T0"}),
         phase_name="Phase 1",
         epic_title="Epic A",
     )
@@ -124,15 +208,78 @@ def test_needs_update_detects_changes():
 
     existing_page = {
         "id": "page-1",
-        "properties": json.loads(json.dumps(new_props)),  # deep copy
+        "properties": copy.deepcopy(new_props),
     }
 
     # No change -> False
     assert needs_update(existing_page, new_props) is False
 
     # Change status -> True
-    modified = json.loads(json.dumps(new_props))
+    modified = copy.deepcopy(new_props)
     modified["Status"]["select"]["name"] = "Done"
     assert needs_update(existing_page, modified) is True
 
 
+def test_task_simple_view_matches_formatted_payload():
+    task = Task(
+        id="T1",
+        title="Task 1",
+        status="In Progress",
+        priority="High",
+        owner="Alex",
+        description="",
+        dependencies=frozenset({"T2", "T0"}),
+        phase_name="Phase 1",
+        epic_title="Epic A",
+    )
+
+    expected = _simple_property_view(format_notion_properties(task), "ID")
+    view = _task_simple_view(task, "ID")
+
+    assert view == expected
+    # Key order matters: digests are taken over the serialized view.
+    assert list(view) == list(expected)
+
+
+def test_orjson_client_sends_json_body_through_sdk_request(monkeypatch):
+    sent = []
+    encoded = []
+    dumps = core._dumps
+
+    def recording_dumps(obj):
+        encoded.append(obj)
+        return dumps(obj)
+
+    monkeypatch.setattr(core, "_dumps", recording_dumps)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200, json={"object": "page", "id": "p1"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = _OrjsonAsyncClient(auth="secret", client=http_client)
+            return await client.request("pages", "POST", body={"title": "Fase é"})
+
+    assert asyncio.run(run()) == {"object": "page", "id": "p1"}
+    (request,) = sent
+    assert request.url.path == "/v1/pages"
+    assert request.headers["Authorization"] == "Bearer secret"
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.content) == {"title": "Fase é"}
+    assert encoded == [{"title": "Fase é"}]
+
+
+def test_rate_limiter_spaces_concurrent_sends():
+    async def run():
+        limiter = _RateLimiter(0.05)
+        loop = asyncio.get_running_loop()
+
+        async def send():
+            await limiter.wait()
+            return loop.time()
+
+        return sorted(await asyncio.gather(*(send() for _ in range(5))))
+
+    sent_at = asyncio.run(run())
+    assert all(later - earlier >= 0.049 for earlier, later in zip(sent_at, sent_at[1:]))